@@ -13,11 +13,19 @@ install_requires = [
     'certifi',
     'hbmqtt',
     'marshmallow',
-    'pytz',
     'sortedcontainers',
     'Sphinx',
+    'uvloop; sys_platform != "win32"',
 ]
 
+extras_require = {
+    # Optional speedups, picked up automatically when installed
+    'speedups': [
+        'aiodns',
+        'orjson; python_version >= "3.6"',
+    ],
+}
+
 
 setup_requires = [
     'pytest_runner',
@@ -63,6 +71,7 @@ setup(
     test_suite="tests",
     include_package_data=True,
     install_requires=install_requires,
+    extras_require=extras_require,
     tests_require=tests_require,
     setup_requires=setup_requires,
 )
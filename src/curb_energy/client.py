@@ -4,29 +4,40 @@ Client module for interacting with the Curb REST and Real-Time APIs
 
 import aiohttp
 import asyncio
-import base64
 import certifi
 import curb_energy
-import json
 import logging
-import pytz
+import os
 import ssl
 import sys
-from collections import namedtuple
+import time
+import warnings
+import weakref
+from collections import OrderedDict
 from typing import Callable
 from typing import Dict
 from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
 from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
 from curb_energy import schema
 from curb_energy import models
 from curb_energy.errors import CurbBaseException
+from curb_energy.runtime import enable_eager_tasks
+from curb_energy.runtime import install_uvloop
 from hbmqtt.client import MQTTClient
 from hbmqtt.mqtt.connack import CONNECTION_ACCEPTED
 from hbmqtt.client import QOS_0
 from hbmqtt.errors import MQTTException
 
+try:
+    import orjson as _json
+except ImportError:  # pragma: no cover
+    import json as _json
+
 
 __all__ = [
     'AuthToken',
@@ -37,12 +48,105 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+if os.environ.get('CURB_USE_UVLOOP') == '1':  # pragma: no cover
+    install_uvloop()
+
 
 # You will need to obtain an OAuth client token for your specific application
 # See <http://docs.energycurb.com/authentication.html> for info on obtaining one
 OAUTH_CLIENT_TOKEN = "CHANGE_ME"
 OAUTH_CLIENT_SECRET = "CHANGE_ME"
 
+# Path to the CA bundle used to verify secure connections
+_CAFILE = certifi.where()
+
+# Fields of an OAuth2 token response that are accepted by AuthToken
+_TOKEN_FIELDS = frozenset(['access_token', 'refresh_token', 'expires_in',
+                           'user_id', 'token_type'])
+
+# Cached reference to the UTC timezone singleton
+_UTC = timezone.utc
+
+# Process-wide SSL context, created on first use by _default_ssl_context()
+_DEFAULT_SSL_CONTEXT = None
+
+# Connection pools shared by RestApiClient instances, keyed by event loop.
+# Each entry is a [connector, number of clients using it] pair.
+_SHARED_CONNECTORS = weakref.WeakKeyDictionary()
+
+
+def _dumps(obj) -> str:
+    """
+    Helper function to serialize an object into a JSON string. orjson
+    returns bytes whereas the stdlib json module returns str.
+    """
+    data = _json.dumps(obj)
+    return data.decode() if isinstance(data, bytes) else data
+
+
+def _default_ssl_context() -> ssl.SSLContext:
+    """
+    Helper function to return an SSL context that trusts the certifi CA
+    bundle. The bundle is only loaded once per process.
+
+    :rtype: ssl.SSLContext
+    """
+    global _DEFAULT_SSL_CONTEXT
+    if _DEFAULT_SSL_CONTEXT is None:
+        _DEFAULT_SSL_CONTEXT = ssl.create_default_context(cafile=_CAFILE)
+    return _DEFAULT_SSL_CONTEXT
+
+
+def _acquire_shared_connector(loop: asyncio.AbstractEventLoop,
+                              kwargs: Dict) -> aiohttp.TCPConnector:
+    """
+    Helper function to return the connection pool shared by the REST API
+    clients running on the given event loop. A new pool is created if there
+    is none yet, or if the previous one was closed. Every call must be
+    paired with :func:`_release_shared_connector`.
+
+    :param loop: The event loop the clients run on
+    :param kwargs: Connector settings used when creating a new pool
+    """
+    entry = _SHARED_CONNECTORS.get(loop)
+    if entry is None or entry[0].closed:
+        entry = [_make_connector(_default_ssl_context(), kwargs), 0]
+        _SHARED_CONNECTORS[loop] = entry
+    entry[1] += 1
+    return entry[0]
+
+
+async def _release_shared_connector(loop: asyncio.AbstractEventLoop,
+                                    connector: aiohttp.TCPConnector):
+    """
+    Helper function to release a connection pool returned by
+    :func:`_acquire_shared_connector`. The pool is closed once the last
+    client using it releases it.
+
+    :param loop: The event loop the pool was acquired on
+    :param connector: The pool being released
+    """
+    entry = _SHARED_CONNECTORS.get(loop)
+    if entry is None or entry[0] is not connector:
+        return
+
+    entry[1] -= 1
+    if entry[1] <= 0:
+        del _SHARED_CONNECTORS[loop]
+        await connector.close()
+
+
+def _make_connector(ssl_context: ssl.SSLContext,
+                    kwargs: Dict) -> aiohttp.TCPConnector:
+    """
+    Helper function to create a connection pool. aiohttp resolves hostnames
+    with aiodns on its own when it is installed (``curb_energy[speedups]``).
+
+    :param ssl_context: SSL context for secure connections
+    :param kwargs: Connector settings
+    """
+    return aiohttp.TCPConnector(ssl=ssl_context, **kwargs)
+
 
 def now() -> datetime:
     """
@@ -50,14 +154,20 @@ def now() -> datetime:
 
     :rtype: datetime.datetime
     """
-    return datetime.now(pytz.utc)
+    return datetime.now(_UTC)
 
 
 class AuthToken(object):
     """
     Curb API OAuth2 Token. For more information, refer to: 
     <https://oauth.net/articles/authentication/>
+
+    Tokens use ``__slots__``, so attributes other than the ones set by the
+    constructor cannot be assigned.
     """
+    __slots__ = ('_generated_on', 'access_token', 'refresh_token',
+                 '_expires_in', '_expiry', 'user_id', 'token_type')
+
     def __init__(self,
                  access_token: str=None,
                  refresh_token: str=None,
@@ -72,14 +182,43 @@ class AuthToken(object):
         :param expires_in: The time, in seconds, this token is valid for. 
         :param user_id: The unique ID of the user associated with this token
         :param token_type: Bearer type 
+        :raises: :class:`ValueError` when the access token is not ASCII
         """
-        self.generated_on = now()
+        if access_token is not None:
+            # Bearer tokens are limited to ASCII characters (RFC 6750)
+            access_token.encode('ascii')
+
+        self._generated_on = now()
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.expires_in = expires_in
         self.user_id = user_id
         self.token_type = token_type
 
+    @property
+    def generated_on(self) -> datetime:
+        """
+        The date (in UTC) the token was generated on
+        """
+        return self._generated_on
+
+    @generated_on.setter
+    def generated_on(self, value: datetime):
+        self._generated_on = value
+        self._expiry = value + timedelta(0, self._expires_in or 0)
+
+    @property
+    def expires_in(self) -> int:
+        """
+        The time, in seconds, this token is valid for since it was generated
+        """
+        return self._expires_in
+
+    @expires_in.setter
+    def expires_in(self, value: int):
+        self._expires_in = value
+        self._expiry = self._generated_on + timedelta(0, value or 0)
+
     @property
     def expiry(self) -> datetime:
         """
@@ -88,22 +227,28 @@ class AuthToken(object):
         :return: Expiry date (in UTC)
         :rtype: datetime.datetime
         """
-        return self.generated_on + timedelta(0, self.expires_in)
+        return self._expiry
 
     @property
     def is_valid(self) -> bool:
-        return self.access_token and self.refresh_token and now() < self.expiry
+        """
+        True if the token has both an access and refresh token and has not
+        expired yet
+        """
+        if not (self.access_token and self.refresh_token):
+            return False
+        return datetime.now(_UTC) < self._expiry
 
     @staticmethod
-    def from_json(data: str) -> 'AuthToken':
+    def from_json(data) -> 'AuthToken':
         """
         Creates an AuthToken object from the given JSON payload.
 
-        :param data: Token data
+        :param data: Token data (str or bytes)
         :return: Creates an AuthToken instance from the given payload
         :raises: :class:`ValueError`
         """
-        d = json.loads(data)
+        d = _json.loads(data)
         return AuthToken(access_token=d.get('access_token'),
                          refresh_token=d.get('refresh_token'),
                          expires_in=d.get('expires_in'),
@@ -117,7 +262,7 @@ class AuthToken(object):
 
         :return: JSON version of the AuthToken
         """
-        return json.dumps(
+        return _dumps(
             dict(access_token=self.access_token,
                  refresh_token=self.refresh_token,
                  expires_in=(self.expiry - now()).total_seconds(),
@@ -134,19 +279,18 @@ class AuthToken(object):
             return NotImplemented
 
         # The expiration period of a token can be ignored
-        attrs = ['access_token', 'refresh_token', 'user_id', 'token_type']
-        return all([getattr(self, a) == getattr(other, a) for a in attrs])
+        return ((self.access_token, self.refresh_token, self.user_id,
+                 self.token_type) ==
+                (other.access_token, other.refresh_token, other.user_id,
+                 other.token_type))
 
     def __ne__(self, other: 'AuthToken'):
-        if not isinstance(other, AuthToken):
-            return NotImplemented
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
 
-        # The expiration period of a token can be ignored
-        attrs = ['access_token', 'refresh_token', 'user_id', 'token_type']
-        return any([getattr(self, a) != getattr(other, a) for a in attrs])
 
-
-RealTimeMessage = namedtuple('RealTimeMessage', ['timestamp', 'measurements'])
+RealTimeMessage = NamedTuple('RealTimeMessage', [('timestamp', int),
+                                                 ('measurements', list)])
 
 
 class RealTimeClient(object):
@@ -158,14 +302,20 @@ class RealTimeClient(object):
         Refactor to support different access mechanisms. For now, 
         we're limited to using MQTT over WebSockets
     """
+    __slots__ = ('_config', '_connected', '_eager_tasks', '_impl', '_pending',
+                 '_streaming')
 
     def __init__(self, config: models.RealTimeConfig,
-                 driver: Callable=MQTTClient):
+                 driver: Callable=MQTTClient,
+                 eager_tasks: bool=False):
         """
         Create an instance of :class:`RealTimeClient`.
 
         :param config: Real Time Config
         :param driver: Real Time client driver
+        :param eager_tasks: Opt in to the eager task factory on the event loop
+                            the client connects on, when available (Python
+                            3.12+). This affects every task on that loop.
         
         Example:
         
@@ -187,20 +337,25 @@ class RealTimeClient(object):
         """
         self._config = config
         self._connected = False
+        self._eager_tasks = eager_tasks
         self._impl = driver()
+        self._pending = None
         self._streaming = False
 
     async def connect(self):
         """
         Connect to the Real-time API
         """
+        if self._eager_tasks:
+            # Called from a coroutine, so this is the running loop
+            enable_eager_tasks(asyncio.get_event_loop())
 
-        # FIXME: HBMQTT + ssl_context for consistency?
-        connect_kwargs = {}
+        # FIXME: HBMQTT builds its own SSL context from the CA file on every
+        # connect and does not accept a pre-built one
         if self.config.url.startswith(('wss', 'https')):
-            connect_kwargs['cafile'] = certifi.where()
-
-        rc = await self._impl.connect(uri=self.config.url, **connect_kwargs)
+            rc = await self._impl.connect(uri=self.config.url, cafile=_CAFILE)
+        else:
+            rc = await self._impl.connect(uri=self.config.url)
         self._connected = rc == CONNECTION_ACCEPTED
 
         await self._impl.subscribe([(self.config.topic, QOS_0)])
@@ -211,6 +366,10 @@ class RealTimeClient(object):
         """
 
         self._connected = False
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
         await self._impl.unsubscribe(self.config.topic)
         await self._impl.disconnect()
 
@@ -249,6 +408,47 @@ class RealTimeClient(object):
         if self.is_connected:
             await self.disconnect()
 
+    async def _next_message(self, timeout: float=None):
+        """
+        Helper function to wait for the next message from the driver. When
+        the timeout expires, the pending delivery is kept for the next call
+        so that no message is lost.
+
+        :param timeout: Time in seconds to wait, or None to wait indefinitely
+        :raises: :class:`asyncio.TimeoutError`
+        """
+        if self._pending is None:
+            if timeout is None:
+                return await self._impl.deliver_message()
+            self._pending = asyncio.ensure_future(self._impl.deliver_message())
+
+        done, _ = await asyncio.wait([self._pending], timeout=timeout)
+        if not done:
+            raise asyncio.TimeoutError()
+
+        pending, self._pending = self._pending, None
+        return pending.result()
+
+    @staticmethod
+    def _decode(message) -> RealTimeMessage:
+        """
+        Helper function to decode a message from the real-time API
+
+        :param message: The message returned by the driver
+        :raises: :class:`ValueError`, :class:`KeyError`
+        """
+        packet = message.publish_packet
+        """ :type: hbmqtt.mqtt.publish.PublishPacket """
+
+        data = packet.payload.data
+        logger.debug("%s => %d bytes", packet.variable_header.topic_name,
+                     len(data))
+
+        # orjson accepts the raw payload bytes without decoding first
+        decoded = _json.loads(data)
+        return RealTimeMessage(timestamp=decoded['ts'],
+                               measurements=decoded['measurements'])
+
     async def read(self) -> RealTimeMessage:
         """
         Returns a single stream from the real-time API, or None when an
@@ -260,28 +460,68 @@ class RealTimeClient(object):
         """
         self._streaming = True
         try:
-            message = await self._impl.deliver_message()
+            message = await self._next_message()
             """ :type: hbmqtt.session.ApplicationMessage """
 
-            packet = message.publish_packet
-            """ :type: hbmqtt.mqtt.publish.PublishPacket """
+            return self._decode(message)
+        except (MQTTException, ValueError, KeyError) as err:
+            logger.warning("Error reading packet: %s", err)
 
-            logger.debug("{} => {}".format(
-                packet.variable_header.topic_name,
-                packet.payload.data)
-            )
+    async def read_batch(self,
+                         max_n: int=64,
+                         timeout: float=0.01,
+                         max_wait: float=None) -> List[RealTimeMessage]:
+        """
+        Returns up to `max_n` streams from the real-time API. This waits for
+        the first message, then collects any further messages that arrive
+        within `timeout` seconds of each other. Invalid messages are skipped.
+
+        :param max_n: The maximum number of messages to return
+        :param timeout: Time in seconds to wait for each subsequent message
+        :param max_wait: Time in seconds, counted from the first message,
+                         after which the batch is returned even if messages
+                         keep arriving. Unbounded by default.
+        :returns: A list of measurements
+        """
+        self._streaming = True
+        loop = asyncio.get_event_loop()
+        batch = []
+        wait = None
+        deadline = None
+        while len(batch) < max_n:
+            try:
+                message = await self._next_message(timeout=wait)
+                batch.append(self._decode(message))
+            except asyncio.TimeoutError:
+                break
+            except (ValueError, KeyError) as err:
+                logger.warning("Error reading packet: %s", err)
+            except MQTTException as err:
+                logger.warning("Error reading packet: %s", err)
+                break
+
+            wait = timeout
+            if max_wait is not None:
+                if deadline is None:
+                    deadline = loop.time() + max_wait
+                wait = min(timeout, max(0, deadline - loop.time()))
 
-            decoded = json.loads(packet.payload.data)
-            return RealTimeMessage(timestamp=decoded['ts'],
-                                   measurements=decoded['measurements'])
-        except (MQTTException, json.decoder.JSONDecodeError, KeyError) as err:
-            logger.warning("Error reading packet: {}".format(err))
+        return batch
 
 
 class RestApiClient(object):
     """
     A client for the `Curb REST API <http://docs.energycurb.com/>`_
     """
+    __slots__ = ('api_url', 'auth_username', 'auth_password', 'client_token',
+                 'client_secret', '_auth_token', '_auth_header_cache',
+                 '_app_auth_cache',
+                 '_entry_point', '_profiles_url', '_devices_url',
+                 '_ssl_context', '_connector_kwargs', '_eager_tasks',
+                 '_session', '_owns_session', '_shared_pool', '_cache_ttl',
+                 '_historical_cache', '_refresh_lock', '_refresh_handle',
+                 '_refresh_task')
+
     API_URL = "https://app.energycurb.com"
     USER_AGENT = 'CurbEnergy-RestApiClient/' + curb_energy.__version__
 
@@ -293,6 +533,24 @@ class RestApiClient(object):
     WATT = 'w'
     DOLLAR_PER_HOUR = '$/hr'
 
+    # Time in seconds before expiry at which access tokens are refreshed
+    REFRESH_MARGIN = 60
+
+    # Maximum number of cached historical data responses; the least recently
+    # used one is evicted first
+    HISTORICAL_CACHE_SIZE = 256
+
+    # Connection pool defaults. Idle connections are kept alive for 75s
+    # (nginx's default keepalive_timeout) so that sequential requests reuse
+    # an established TLS connection instead of performing a new handshake.
+    CONNECTOR_KWARGS = {
+        'limit': 100,
+        'limit_per_host': 32,
+        'keepalive_timeout': 75,
+        'enable_cleanup_closed': True,
+        'ttl_dns_cache': 300,
+    }
+
     def __init__(self,
                  loop: asyncio.AbstractEventLoop = None,
                  username: str = None,
@@ -301,7 +559,11 @@ class RestApiClient(object):
                  api_url: str = API_URL,
                  client_token: str = OAUTH_CLIENT_TOKEN,
                  client_secret: str = OAUTH_CLIENT_SECRET,
-                 ssl_context: ssl.SSLContext = None):
+                 ssl_context: ssl.SSLContext = None,
+                 eager_tasks: bool = False,
+                 connector_kwargs: dict = None,
+                 session: aiohttp.ClientSession = None,
+                 cache_ttl: float = 0):
         """
         Initialize the REST API client.
 
@@ -312,13 +574,24 @@ class RestApiClient(object):
         
         You can also pass an existing token instead of a username/password.
 
+        :param loop: Deprecated and ignored
         :param username: Username
         :param password: Password
         :param auth_token: Oauth2 client token
         :param api_url: The URL to the Curb REST API
         :param client_token: The application client token (app identifier)
         :param client_secret: The application client secret (app password)
-        :param ssl_context: Optional SSL
+        :param ssl_context: Optional SSL context. Defaults to a shared
+                            context trusting the certifi CA bundle.
+        :param eager_tasks: Opt in to the eager task factory on the event loop
+                            when available (Python 3.12+). This affects every
+                            task on that loop.
+        :param connector_kwargs: Overrides for the connection pool settings in
+                                 :attr:`CONNECTOR_KWARGS`
+        :param session: An existing HTTP session to use. The client does not
+                        close sessions it did not create.
+        :param cache_ttl: Time in seconds historical data responses are
+                          cached for. Caching is disabled by default (0).
 
         .. warning::
         
@@ -339,8 +612,7 @@ class RestApiClient(object):
                                      password=pass, 
                                      client_token='CHANGE_ME', 
                                      client_secret='CHANGE_ME') as client:
-                profiles = await client.profiles()
-                devices = await client.devices()
+                profiles, devices = await client.bootstrap()
 
                 for profile in profiles:
                     print(profile)
@@ -363,8 +635,10 @@ class RestApiClient(object):
                 # code goes here
                 
             finally:
-                await client.session.close()            
+                await client.close()
 
+        Create one client per application and reuse it for all requests, so
+        that the underlying TCP/TLS connections are kept alive and reused.
         """
         self.api_url = api_url
         self.auth_username = username
@@ -372,23 +646,103 @@ class RestApiClient(object):
         self.client_token = client_token
         self.client_secret = client_secret
         self._auth_token = auth_token
-        self._loop = loop
+        self._auth_header_cache = (None, None)
+        self._app_auth_cache = None
         self._entry_point = None
+        self._profiles_url = None
+        self._devices_url = None
+        self._ssl_context = ssl_context
+        self._connector_kwargs = connector_kwargs
+        self._eager_tasks = eager_tasks
+        self._session = session
+        self._owns_session = session is None
+        self._shared_pool = None
+        self._cache_ttl = cache_ttl
+        self._historical_cache = OrderedDict()
+        self._refresh_lock = None
+        self._refresh_handle = None
+        self._refresh_task = None
+
+        if loop is not None:
+            warnings.warn("The loop argument is deprecated and ignored; the "
+                          "session is bound to the loop running the first "
+                          "request", DeprecationWarning, stacklevel=2)
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """
+        Helper function to create the HTTP session on first use, so that it
+        is bound to the event loop actually running the requests.
+
+        :return: The HTTP session
+        """
+        if self._session is not None:
+            return self._session
+
+        loop = asyncio.get_event_loop()
+        if self._eager_tasks:
+            enable_eager_tasks(loop)
+
+        # Clients using the default settings share one connection pool per
+        # event loop; custom settings get a pool of their own.
+        shared = self._ssl_context is None and self._connector_kwargs is None
+        if shared:
+            conn = _acquire_shared_connector(loop, self.CONNECTOR_KWARGS)
+            self._shared_pool = (loop, conn)
+        else:
+            kwargs = dict(self.CONNECTOR_KWARGS,
+                          **(self._connector_kwargs or {}))
+            conn = _make_connector(
+                self._ssl_context or _default_ssl_context(), kwargs)
 
-        conn = aiohttp.TCPConnector(ssl_context=ssl_context)
         h = {'User-Agent': self.USER_AGENT}
-        self._session = aiohttp.ClientSession(connector=conn, headers=h)
+        self._session = aiohttp.ClientSession(connector=conn, headers=h,
+                                              connector_owner=not shared)
+        return self._session
 
     def _auth_headers(self) -> Dict:
         """
-        Helper function to return HTTP headers for the REST API
+        Helper function to return HTTP headers for the REST API. The headers
+        are only rebuilt when the access token changes; callers must not
+        modify the returned dict.
         
         :return: HTTP authorization headers
         """
-        encoded = base64.b64encode(self.auth_token.access_token.encode())
-        return {
-            'Authorization': 'Bearer {}'.format(encoded.decode('latin1'))
-        }
+        access_token = self.auth_token.access_token
+        cached_token, headers = self._auth_header_cache
+        if access_token is cached_token:
+            return headers
+
+        # Bearer tokens are sent verbatim (RFC 6750)
+        headers = {'Authorization': 'Bearer ' + access_token}
+        self._auth_header_cache = (access_token, headers)
+        return headers
+
+    def _app_auth(self) -> aiohttp.BasicAuth:
+        """
+        Helper function to return the HTTP basic auth credentials identifying
+        the application. They are only rebuilt when the client token or
+        secret changes.
+
+        :return: The application credentials
+        """
+        auth = self._app_auth_cache
+        if (auth is None or auth.login != self.client_token or
+                auth.password != self.client_secret):
+            auth = aiohttp.BasicAuth(self.client_token,
+                                     password=self.client_secret)
+            self._app_auth_cache = auth
+        return auth
+
+    @staticmethod
+    def _make_token(data: Dict) -> AuthToken:
+        """
+        Helper function to create an AuthToken from an OAuth2 token response.
+        Fields not known to AuthToken are ignored.
+
+        :param data: The decoded token response
+        """
+        return AuthToken(**{k: v for k, v in data.items()
+                            if k in _TOKEN_FIELDS})
 
     def _make_url(self, path: str) -> str:
         """
@@ -396,7 +750,7 @@ class RestApiClient(object):
 
         :param path: The path to append to the base API prefix
         """
-        return "{}{}".format(self.api_url, path)
+        return self.api_url + path
 
     @property
     def auth_token(self) -> AuthToken:
@@ -409,7 +763,10 @@ class RestApiClient(object):
 
     @property
     def session(self) -> aiohttp.ClientSession:
-        return self._session
+        """
+        The HTTP session, created on first access within the running loop
+        """
+        return self._ensure_session()
 
     async def authenticate(self) -> AuthToken:
         """
@@ -421,19 +778,81 @@ class RestApiClient(object):
         :returns: The authentication token
         :raises: :class:`~curb_energy.errors.CurbBaseException`
         """
-        token = self._auth_token
-        if token is None:
-            token = await self.fetch_access_token()
+        # Concurrent callers wait for a single authentication, then find the
+        # new token valid
+        async with self._get_refresh_lock():
+            token = self._auth_token
+            if token is None:
+                token = await self.fetch_access_token()
 
-        elif not token.is_valid:
-            token = await self.refresh_access_token()
+            elif not token.is_valid:
+                token = await self.refresh_access_token()
 
-        if not (token and token.is_valid):
-            raise CurbBaseException("Authentication Error")
+            if not (token and token.is_valid):
+                raise CurbBaseException("Authentication Error")
+
+            self._auth_token = token
+            self._auth_header_cache = (None, None)
+            self._schedule_refresh()
 
-        self._auth_token = token
         return self.auth_token
 
+    def _get_refresh_lock(self) -> asyncio.Lock:
+        """
+        Helper function to return the lock serializing token refreshes. It is
+        created on first use so that it is bound to the running loop.
+        """
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        return self._refresh_lock
+
+    def _schedule_refresh(self):
+        """
+        Helper function to schedule a background refresh of the access token
+        :attr:`REFRESH_MARGIN` seconds before it expires, so that requests
+        do not have to refresh an expired token first.
+        """
+        if self._refresh_handle is not None:
+            self._refresh_handle.cancel()
+
+        remaining = (self._auth_token.expiry - now()).total_seconds()
+        delay = max(remaining - self.REFRESH_MARGIN, remaining / 2, 1)
+        loop = asyncio.get_event_loop()
+        self._refresh_handle = loop.call_later(delay, self._start_refresh)
+
+    def _start_refresh(self):
+        self._refresh_handle = None
+        if self._session is not None and self._session.closed:
+            # The session was closed before the refresh came due
+            return
+        self._refresh_task = asyncio.ensure_future(self._background_refresh())
+
+    def _cancel_refresh(self):
+        if self._refresh_handle is not None:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
+
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    async def _background_refresh(self):
+        """
+        Refreshes the access token ahead of its expiry. On failure, the token
+        is refreshed on demand by the next request once it expires.
+        """
+        try:
+            async with self._get_refresh_lock():
+                token = await self.refresh_access_token()
+        except (aiohttp.ClientError, CurbBaseException) as err:
+            logger.warning("Unable to refresh access token: %s", err)
+            return
+        finally:
+            self._refresh_task = None
+
+        if token is None:
+            logger.warning("Unable to refresh access token")
+
     async def fetch_access_token(self,
                                  client_token: str=None,
                                  client_secret: str=None,
@@ -458,16 +877,20 @@ class RestApiClient(object):
             'password': password or self.auth_password,
         }
 
-        _token = client_token if client_token else self.client_token
-        _secret = client_secret if client_secret else self.client_secret
-
-        auth = aiohttp.BasicAuth(_token, password=_secret)
-        async with self._session.post(url, data=payload, auth=auth) as response:
+        if client_token or client_secret:
+            _token = client_token if client_token else self.client_token
+            _secret = client_secret if client_secret else self.client_secret
+            auth = aiohttp.BasicAuth(_token, password=_secret)
+        else:
+            auth = self._app_auth()
+        async with self.session.post(url, data=payload, auth=auth) as response:
             if response.status != 200:
-                logger.warning("Unsuccessful request: {}".format(response.text))
+                logger.warning("Unsuccessful request: HTTP %s", response.status)
                 return
 
-        return AuthToken(**await response.json())
+            data = _json.loads(await response.read())
+
+        return self._make_token(data)
 
     async def refresh_access_token(self) -> AuthToken:
         """
@@ -492,17 +915,21 @@ class RestApiClient(object):
             'user_id': self.auth_token.user_id,
         }
 
-        auth = aiohttp.BasicAuth(self.client_token, password=self.client_secret)
-        async with self._session.post(url, data=payload, auth=auth) as response:
+        auth = self._app_auth()
+        async with self.session.post(url, data=payload, auth=auth) as response:
             if response.status != 200:
-                logger.warning("Unsuccessful request: {}".format(response.text))
+                logger.warning("Unsuccessful request: HTTP %s", response.status)
                 return
 
-        token = AuthToken(**await response.json())
+            data = _json.loads(await response.read())
+
+        token = self._make_token(data)
 
         # Refreshing tokens automatically invalidates older tokens, requiring
         # us to use the new token effective immediately.
         self._auth_token = token
+        self._auth_header_cache = (None, None)
+        self._schedule_refresh()
         return token
 
     async def entry_point(self) -> Dict:
@@ -515,6 +942,14 @@ class RestApiClient(object):
         """
         self._entry_point = await self._fetch(schema.EntryPointSchema,
                                               self._make_url("/api"))
+
+        # The resource URLs don't change for the lifetime of the session
+        if self._entry_point:
+            self._profiles_url = self._make_url(
+                self._entry_point['profiles']['href'])
+            self._devices_url = self._make_url(
+                self._entry_point['devices']['href'])
+
         return self._entry_point
 
     async def profiles(self) -> List[models.Profile]:
@@ -526,8 +961,7 @@ class RestApiClient(object):
         if not self._entry_point:
             await self.entry_point()
 
-        url = self._make_url(self._entry_point['profiles']['href'])
-        return await self._fetch(schema.ProfilesSchema, url)
+        return await self._fetch(schema.ProfilesSchema, self._profiles_url)
 
     async def devices(self) -> List[models.Device]:
         """
@@ -538,10 +972,31 @@ class RestApiClient(object):
         if not self._entry_point:
             await self.entry_point()
 
-        url = self._make_url(self._entry_point['devices']['href'])
-        container = await self._fetch(schema.DevicesSchema, url)
+        container = await self._fetch(schema.DevicesSchema, self._devices_url)
         return container['devices']
 
+    async def bootstrap(self) -> Tuple[List[models.Profile],
+                                       List[models.Device]]:
+        """
+        Return the profiles and devices associated with the authenticated
+        user. Both are fetched concurrently once the entry point is loaded.
+
+        :returns: A tuple of the profiles and devices
+
+        Example:
+
+        .. code-block:: python
+
+            async with RestApiClient(...) as client:
+                profiles, devices = await client.bootstrap()
+        """
+        if not self._entry_point:
+            await self.entry_point()
+
+        profiles, devices = await asyncio.gather(self.profiles(),
+                                                 self.devices())
+        return profiles, devices
+
     async def historical_data(self,
                               profile_id: int=0,
                               granularity: str=PER_HOUR,
@@ -557,14 +1012,38 @@ class RestApiClient(object):
         :param since: Start time of measurements (in epoch format). Use 0 to
                       indicate the beginning, which is the default. 
         :param until: End time of measurements (in epoch format) 
+
+        If the client was created with a ``cache_ttl``, responses for windows
+        with an explicit ``until`` are cached for that many seconds, so
+        repeated queries for the same window do not hit the API again. Cached
+        results are shared between callers and must not be modified.
         """
-        url = self._make_url('/api/profiles/%d/historical-data' % profile_id)
+        key = (profile_id, granularity, unit, since, until)
+        cache = self._historical_cache
+        cached = cache.get(key) if until is not None else None
+        if cached is not None:
+            expiry, measurement = cached
+            if time.monotonic() < expiry:
+                cache.move_to_end(key)
+                return measurement
+            del cache[key]
+
+        url = (self.api_url + '/api/profiles/' + str(int(profile_id)) +
+               '/historical-data')
         params = dict(granularity=granularity, unit=unit, since=since)
 
         if until is not None:
             params['until'] = until
 
-        return await self._fetch(schema.HistoricalData, url, params=params)
+        measurement = await self._fetch(schema.HistoricalData, url,
+                                        params=params)
+        if (measurement is not None and until is not None and
+                self._cache_ttl > 0):
+            cache[key] = (time.monotonic() + self._cache_ttl, measurement)
+            if len(cache) > self.HISTORICAL_CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return measurement
 
     async def __aenter__(self):
         """
@@ -572,6 +1051,7 @@ class RestApiClient(object):
         no access token was provided (or if it is already expired)
         """
         if self.auth_token and self.auth_token.is_valid:
+            self._schedule_refresh()
             return self
 
         try:
@@ -586,9 +1066,27 @@ class RestApiClient(object):
         """
         Automatically disconnect when used as a context-manager
         """
-        if not self._session.closed:
+        await self.close()
+
+    async def close(self):
+        """
+        Stops the background token refresh and closes the HTTP session, unless
+        it was supplied by the caller. The client cannot be used afterwards.
+
+        Always use this (or the context manager) rather than closing
+        :attr:`session` directly, which leaves the connection pool shared
+        with other clients open.
+        """
+        self._cancel_refresh()
+        if (self._owns_session and self._session is not None and
+                not self._session.closed):
             await self._session.close()
 
+        if self._shared_pool is not None:
+            loop, conn = self._shared_pool
+            self._shared_pool = None
+            await _release_shared_connector(loop, conn)
+
     async def _fetch(self, schema_class: schema.BaseSchema,
                      url: str,
                      params: dict=None) -> Optional[models.BaseModel]:
@@ -606,14 +1104,23 @@ class RestApiClient(object):
         if not (self.auth_token and self.auth_token.is_valid):
             await self.authenticate()
 
-        async with self._session.get(url,
+        # Wait for a refresh in progress rather than sending a token that is
+        # about to be replaced
+        lock = self._refresh_lock
+        if lock is not None and lock.locked():
+            async with lock:
+                pass
+
+        async with self.session.get(url,
                                      headers=self._auth_headers(),
                                      params=params) as response:
-            logger.info(response.text)
+            logger.debug("GET %s => HTTP %s", url, response.status)
             try:
-                data = await response.json()
-            except json.decoder.JSONDecodeError as err:
-                logger.warning('Invalid JSON: {}'.format(err))
+                # Decode the raw body directly, skipping aiohttp's
+                # intermediate str decoding
+                data = _json.loads(await response.read())
+            except ValueError as err:
+                logger.warning('Invalid JSON: %s', err)
                 return None
 
-            return schema_class().load(data).data
+            return schema.get_schema(schema_class).load(data).data
@@ -9,13 +9,25 @@ from typing import Optional
 
 
 class BaseModel(object):
-    pass
+    __slots__ = ()
+
+    # Names of the public attributes, in serialization order
+    _FIELDS = ()
+
+    def _asdict(self) -> dict:
+        """
+        Return the public attributes of the model as a new dictionary
+        """
+        return {k: getattr(self, k) for k in self._FIELDS}
 
 
 class RealTimeConfig(BaseModel):
     """
     Configuration for the Real-Time client
     """
+    __slots__ = ('topic', 'format', 'prefix', 'ws_url')
+    _FIELDS = __slots__
+
     def __init__(self,
                  topic: str=None,
                  format: str='curb',
@@ -49,9 +61,12 @@ class BillingModel(BaseModel):
     The Billing Model describes the utility and billing tier for a given 
     customer.     
     """
+    __slots__ = ('name', 'sector', 'label', 'utility')
+    _FIELDS = __slots__
+
     RESIDENTIAL = 'Residential'
     COMMERCIAL = 'Commercial'
-    SECTORS = [RESIDENTIAL, COMMERCIAL]
+    SECTORS = (RESIDENTIAL, COMMERCIAL)
 
     def __init__(self,
                  sector: str=RESIDENTIAL,
@@ -84,15 +99,8 @@ class BillingModel(BaseModel):
         if not isinstance(other, BillingModel):
             return NotImplemented
 
-        attrs = ['name', 'sector', 'label', 'utility']
-        return all([getattr(self, a) == getattr(other, a) for a in attrs])
-
-    def __ne__(self, other):
-        if not isinstance(other, BillingModel):
-            return NotImplemented
-
-        attrs = ['name', 'sector', 'label', 'utility']
-        return any([getattr(self, a) != getattr(other, a) for a in attrs])
+        return (self.name, self.sector, self.label, self.utility) == \
+            (other.name, other.sector, other.label, other.utility)
 
 
 class Billing(BaseModel):
@@ -100,6 +108,10 @@ class Billing(BaseModel):
     Billing describes how and when the customer is billed and is associated 
     with a :class:`BillingModel` instance.     
     """
+    __slots__ = ('profile_id', 'billing_model', 'day_of_month', 'zip_code',
+                 'dollar_per_kwh')
+    _FIELDS = __slots__
+
     def __init__(self,
                  profile_id: int=-1,
                  billing_model: BillingModel=None,
@@ -130,23 +142,19 @@ class Billing(BaseModel):
         if not isinstance(other, Billing):
             return NotImplemented
 
-        attrs = ['profile_id', 'billing_model', 'day_of_month', 'zip_code',
-                 'dollar_per_kwh']
-        return all([getattr(self, a) == getattr(other, a) for a in attrs])
-
-    def __ne__(self, other):
-        if not isinstance(other, Billing):
-            return NotImplemented
-
-        attrs = ['profile_id', 'billing_model', 'day_of_month', 'zip_code',
-                 'dollar_per_kwh']
-        return any([getattr(self, a) != getattr(other, a) for a in attrs])
+        return ((self.profile_id, self.billing_model, self.day_of_month,
+                 self.zip_code, self.dollar_per_kwh) ==
+                (other.profile_id, other.billing_model, other.day_of_month,
+                 other.zip_code, other.dollar_per_kwh))
 
 
 class Sensor(BaseModel):
     """
     An energy monitoring device (in this case, the Curb Hub) 
     """
+    __slots__ = ('id', 'name', 'arbitrary_name')
+    _FIELDS = __slots__
+
     def __init__(self,
                  id: int=-1,
                  name: str=None,
@@ -171,15 +179,8 @@ class Sensor(BaseModel):
         if not isinstance(other, Sensor):
             return NotImplemented
 
-        attrs = ['id', 'name', 'arbitrary_name']
-        return all([getattr(self, a) == getattr(other, a) for a in attrs])
-
-    def __ne__(self, other: 'Sensor'):
-        if not isinstance(other, Sensor):
-            return NotImplemented
-
-        attrs = ['id', 'name', 'arbitrary_name']
-        return any([getattr(self, a) != getattr(other, a) for a in attrs])
+        return (self.id, self.name, self.arbitrary_name) == \
+            (other.id, other.name, other.arbitrary_name)
 
     def __repr__(self):  # pragma: no cover
         return 'Sensor-%s (%s)' % (self.id, self.name)
@@ -189,6 +190,9 @@ class SensorGroup(BaseModel):
     """
     A logical grouping of sensors
     """
+    __slots__ = ('id', 'sensors')
+    _FIELDS = __slots__
+
     def __init__(self,
                  id: int=-1,
                  sensors: Optional[List[Sensor]]=None,
@@ -212,12 +216,6 @@ class SensorGroup(BaseModel):
 
         return self.id == other.id and self.sensors == other.sensors
 
-    def __ne__(self, other: 'SensorGroup'):
-        if not isinstance(other, SensorGroup):
-            return NotImplemented
-
-        return self.id != other.id or self.sensors != other.sensors
-
     def __repr__(self):  # pragma: no cover
         return 'SensorGroup-%s (%s)' % (self.id, self.sensors)
 
@@ -231,6 +229,8 @@ class Device(BaseModel):
     
         Clarify with Curb what they really intend by this.
     """
+    __slots__ = ('id', 'building_type', 'name', 'timezone', 'sensor_groups')
+    _FIELDS = __slots__
 
     def __init__(self,
                  id: int=-1,
@@ -262,15 +262,10 @@ class Device(BaseModel):
         if not isinstance(other, Device):
             return NotImplemented
 
-        attrs = ['id', 'name', 'building_type', 'timezone', 'sensor_groups']
-        return all([getattr(self, a) == getattr(other, a) for a in attrs])
-
-    def __ne__(self, other):
-        if not isinstance(other, Device):
-            return NotImplemented
-
-        attrs = ['id', 'name', 'building_type', 'timezone', 'sensor_groups']
-        return any([getattr(self, a) != getattr(other, a) for a in attrs])
+        return ((self.id, self.name, self.building_type, self.timezone,
+                 self.sensor_groups) ==
+                (other.id, other.name, other.building_type, other.timezone,
+                 other.sensor_groups))
 
     def __repr__(self):  # pragma: no cover
         return 'Device-%s (%s)' % (self.id, self.name)
@@ -280,6 +275,8 @@ class Register(BaseModel):
     """
     A source of power measurement data.
     """
+    __slots__ = ('id', 'label', 'multiplier', 'flip_domain')
+    _FIELDS = __slots__
 
     def __init__(self,
                  id: str='',
@@ -308,21 +305,17 @@ class Register(BaseModel):
         if not isinstance(other, Register):
             return NotImplemented
 
-        attrs = ['id', 'label', 'flip_domain', 'multiplier']
-        return all([getattr(self, a) == getattr(other, a) for a in attrs])
-
-    def __ne__(self, other):
-        if not isinstance(other, Register):
-            return NotImplemented
-
-        attrs = ['id', 'label', 'flip_domain', 'multiplier']
-        return any([getattr(self, a) != getattr(other, a) for a in attrs])
+        return (self.id, self.label, self.flip_domain, self.multiplier) == \
+            (other.id, other.label, other.flip_domain, other.multiplier)
 
 
 class RegisterGroup(BaseModel):
     """
     A logical grouping of registers according to classification
     """
+    __slots__ = ('grid', 'normals', 'solar', 'use')
+    _FIELDS = __slots__
+
     def __init__(self,
                  grid: Optional[List[Register]],
                  normals: Optional[List[Register]],
@@ -354,6 +347,10 @@ class Profile(BaseModel):
     A profile defines how to interpret data, access real time data, 
     and various other configuration options.
     """
+    _FIELDS = ('id', 'billing', 'display_name', 'register_groups',
+               'registers', 'real_time', 'widgets')
+    __slots__ = _FIELDS + ('_register_index',)
+
     def __init__(self,
                  id: int=-1,
                  display_name: str=None,
@@ -381,6 +378,7 @@ class Profile(BaseModel):
         self.registers = registers if registers is not None else []
         self.real_time = real_time
         self.widgets = widgets
+        self._register_index = None
 
     @property
     def url(self) -> str:   # pragma: no cover
@@ -388,11 +386,43 @@ class Profile(BaseModel):
 
     def find_register(self, id: str) -> Optional[Register]:
         """
-        Return a Register by its unique ID, or :class:`None` if not found
+        Return a Register by its unique ID, or :class:`None` if not found.
+
+        Lookups go through an index of register positions. It is rebuilt
+        whenever :attr:`registers` is reassigned or changes length, or when
+        the indexed position no longer holds the register (such as after
+        ``profile.registers[0] = other``).
         
         :param id: The unique ID of the register to look up
         """
-        return next((r for r in self.registers if r.id == id), None)
+        registers = self.registers
+        index = self._register_index
+        if index is None or index[0] is not registers \
+                or index[1] != len(registers):
+            index = self._index_registers()
+
+        pos = index[2].get(id)
+        if pos is not None and registers[pos].id == id:
+            return registers[pos]
+
+        # The index may be stale if an element was replaced in place, so
+        # confirm the result against the list itself
+        for r in registers:
+            if r.id == id:
+                self._index_registers()
+                return r
+        return None
+
+    def _index_registers(self) -> tuple:
+        """
+        Helper function to (re)build the register index, mapping each
+        register ID to its position in :attr:`registers`
+        """
+        registers = self.registers
+        # Iterate in reverse so the first register wins on duplicate IDs
+        lookup = {registers[i].id: i for i in reversed(range(len(registers)))}
+        index = self._register_index = (registers, len(registers), lookup)
+        return index
 
     def __repr__(self):   # pragma: no cover
         return "Profile-%s" % self.id
@@ -404,12 +434,6 @@ class Profile(BaseModel):
         # FIXME: for now, we only match based on ID
         return self.id == other.id
 
-    def __ne__(self, other):
-        if not isinstance(other, Profile):
-            return NotImplemented
-
-        return self.id != other.id
-
 
 Measurement = namedtuple('Measurement', ['granularity',
                                          'since',
@@ -0,0 +1,68 @@
+"""
+Runtime helpers for tuning the asyncio event loop used by the clients
+"""
+
+import asyncio
+import logging
+
+
+__all__ = [
+    'enable_eager_tasks',
+    'install_uvloop',
+]
+
+logger = logging.getLogger(__name__)
+
+
+def install_uvloop() -> bool:
+    """
+    Sets the asyncio event loop policy to `uvloop`_, a drop-in replacement for
+    the default event loop built on top of libuv. This must be called before
+    the event loop used by the clients is created.
+
+    .. code-block:: python
+
+        from curb_energy.runtime import install_uvloop
+
+        install_uvloop()
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(main())
+
+    The policy is also installed automatically when :mod:`curb_energy.client`
+    is imported with the ``CURB_USE_UVLOOP=1`` environment variable set.
+
+    :return: True if uvloop was installed, False if it is unavailable
+
+    .. _uvloop: https://github.com/MagicStack/uvloop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop is not available; using the default loop")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def enable_eager_tasks(loop: asyncio.AbstractEventLoop) -> bool:
+    """
+    Sets the task factory of the given loop to
+    :func:`asyncio.eager_task_factory` (Python 3.12+), which runs new
+    coroutines synchronously until their first suspension instead of
+    scheduling them on the next iteration of the loop. A task factory that
+    was already set on the loop is left untouched.
+
+    :param loop: The event loop to configure
+    :return: True if eager tasks are enabled on the loop, False otherwise
+    """
+    factory = getattr(asyncio, 'eager_task_factory', None)
+    if factory is None:
+        return False
+
+    current = loop.get_task_factory()
+    if current is None:
+        loop.set_task_factory(factory)
+        return True
+
+    return current is factory
@@ -2,7 +2,10 @@
 The schema module helps convert the Curb API REST resources into 
 Python-friendly objects.
 """
+import functools
 import logging
+import sys
+from types import MappingProxyType
 from marshmallow import Schema
 from marshmallow import fields
 from marshmallow import validate
@@ -14,6 +17,42 @@ from curb_energy import models
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only default for optional "_links"/"_embedded" lookups
+_EMPTY = MappingProxyType({})
+
+
+def _intern(data: dict, key: str) -> dict:
+    """
+    Intern the string value of ``data[key]`` (if present) so that values
+    repeated across resources share a single object and compare by identity.
+    """
+    value = data.get(key)
+    if isinstance(value, str):
+        data[key] = sys.intern(value)
+    return data
+
+
+class FloatMatrix(fields.Field):
+    """
+    A list of rows of floats, such as the historical data matrix.
+
+    The whole matrix is converted in one pass instead of running every cell
+    through nested :class:`~marshmallow.fields.Float` fields, which dominates
+    load time for large time-series payloads.
+    """
+    default_error_messages = {
+        'invalid': 'Not a valid list of numeric rows.'
+    }
+
+    def _serialize(self, value, attr, obj):
+        return value
+
+    def _deserialize(self, value, attr, data):
+        try:
+            return [[float(v) for v in row] for row in value]
+        except (TypeError, ValueError, OverflowError):
+            self.fail('invalid')
+
 
 class HyperLink(Schema):
     href = fields.String(required=True)
@@ -37,17 +76,17 @@ class SensorSchema(BaseSchema):
 
     @pre_load
     def pre_deserialize(self, data):
-        links = data.get('_links', {})
+        links = data.get('_links', _EMPTY)
 
         if 'id' not in data:
-            l = links.get('self', {}).get('href', '')
-            data['id'] = l.lstrip('/api/sensors/')
+            l = links.get('self', _EMPTY).get('href', '')
+            data['id'] = l.rpartition('/')[2]
 
         return data
 
     @post_load
     def create_model(self, data):
-        return models.Sensor(**data)
+        return models.Sensor(**_intern(data, 'name'))
 
 
 class SensorGroupSchema(BaseSchema):
@@ -62,23 +101,23 @@ class SensorGroupSchema(BaseSchema):
 
     @pre_load
     def pre_deserialize(self, data):
-        links = data.get('_links', {})
+        links = data.get('_links', _EMPTY)
 
         if 'id' not in data:
-            l = links.get('self', {}).get('href', '')
-            data['id'] = l.lstrip('/api/sensor_groups/')
+            l = links.get('self', _EMPTY).get('href', '')
+            data['id'] = l.rpartition('/')[2]
 
         return data
 
     @pre_dump
     def pre_serialize(self, data):
-        d = {k: getattr(data, k) for k in vars(data)}
+        d = data._asdict()
         d['_embedded'] = {'sensors': d.pop('sensors')}
         return d
 
     @post_load
     def create_model(self, data):
-        embedded = data.pop('_embedded', {})
+        embedded = data.pop('_embedded', _EMPTY)
         data['sensors'] = embedded.get('sensors', [])
         return models.SensorGroup(**data)
 
@@ -102,25 +141,25 @@ class DeviceSchema(BaseSchema):
 
     @pre_load
     def pre_deserialize(self, data):
-        links = data.get('_links', {})
+        links = data.get('_links', _EMPTY)
 
         if 'id' not in data:
-            l = links.get('self', {}).get('href', '')
-            data['id'] = l.lstrip('/api/devices/')
+            l = links.get('self', _EMPTY).get('href', '')
+            data['id'] = l.rpartition('/')[2]
 
         return data
 
     @pre_dump
     def pre_serialize(self, data):
-        d = {k: getattr(data, k) for k in vars(data)}
+        d = data._asdict()
         d['_embedded'] = {'sensor_groups': d.pop('sensor_groups')}
         return d
 
     @post_load
     def create_model(self, data):
-        embedded = data.pop('_embedded', {})
+        embedded = data.pop('_embedded', _EMPTY)
         data['sensor_groups'] = embedded.get('sensor_groups', [])
-        return models.Device(**data)
+        return models.Device(**_intern(data, 'timezone'))
 
 
 class BillingModelSchema(BaseSchema):
@@ -134,7 +173,7 @@ class BillingModelSchema(BaseSchema):
 
     @post_load
     def create_model(self, data):
-        return models.BillingModel(**data)
+        return models.BillingModel(**_intern(data, 'utility'))
 
 
 class BillingSchema(BaseSchema):
@@ -169,7 +208,7 @@ class RegisterSchema(BaseSchema):
 
     @post_load
     def create_model(self, data):
-        return models.Register(**data)
+        return models.Register(**_intern(data, 'id'))
 
 
 class RegistersSchema(BaseSchema):
@@ -210,7 +249,7 @@ class RealTimeSchema(Schema):
 
     @post_load
     def create_model(self, data):
-        ws_url = data.get('_links', {}).get('ws', {}).get('href')
+        ws_url = data.get('_links', _EMPTY).get('ws', _EMPTY).get('href')
         return models.RealTimeConfig(ws_url=ws_url, **data)
 
 
@@ -234,7 +273,7 @@ class ProfileSchema(Schema):
 
     @pre_dump
     def pre_serialize(self, data):
-        d = {k: getattr(data, k) for k in vars(data)}
+        d = data._asdict()
         d['_embedded'] = {
             'billing': d.pop('billing', {}),
             'registers': {'registers': d.pop('registers', [])}
@@ -251,12 +290,12 @@ class ProfileSchema(Schema):
 
         register_map = {r.id: r for r in profile.registers}
 
-        for g in ['use', 'normals', 'grid', 'solar']:
+        # Point the register groups at the full register definitions,
+        # preserving each group's order
+        for g in ('use', 'normals', 'grid', 'solar'):
             group = getattr(profile.register_groups, g)
-            for register in list(group):
-                if register.id in register_map:
-                    group.remove(register)
-                    group.append(register_map[register.id])
+            setattr(profile.register_groups, g,
+                    [register_map.get(r.id, r) for r in group])
 
         return profile
 
@@ -279,7 +318,7 @@ class ProfilesSchema(BaseSchema):
 
     @post_load
     def create_model(self, data):
-        embedded = data.pop('_embedded', {})
+        embedded = data.pop('_embedded', _EMPTY)
         data['profiles'] = embedded.get('profiles', [])
         return data
 
@@ -309,7 +348,7 @@ class HistoricalData(BaseSchema):
     until = fields.Integer(default=0, missing=0)
     unit = fields.String(validate=validate.OneOf(['w', '$/hr']))
     headers = fields.List(fields.String)
-    data = fields.List(fields.List(fields.Float))
+    data = FloatMatrix()
 
     @pre_load
     def pre_deserialize(self, data):
@@ -324,3 +363,18 @@ class HistoricalData(BaseSchema):
                                   unit=data['unit'],
                                   headers=data['headers'],
                                   data=data['data'])
+
+
+@functools.lru_cache(maxsize=None)
+def get_schema(cls: type, many: bool=False) -> Schema:
+    """
+    Return a shared instance of the given schema class.
+
+    Schemas are stateless once constructed, so a single instance per
+    ``(cls, many)`` pair is reused instead of paying for field setup on
+    every request.
+
+    :param cls: The schema class
+    :param many: Whether the schema handles a collection of objects
+    """
+    return cls(many=many)
@@ -1,6 +1,7 @@
 import argparse
 import asyncio
 import csv
+import io
 import logging
 import os
 import sys
@@ -8,48 +9,100 @@ import textwrap
 from curb_energy.client import AuthToken
 from curb_energy.client import RealTimeClient
 from curb_energy.client import RestApiClient
+from curb_energy.runtime import install_uvloop
 from curb_energy import models
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
 logger = logging.getLogger(__name__)
 
+# Prefix stripped from register URNs in the historical data CSV headers
+_REGISTER_PREFIX = 'urn:energycurb:registers:curb:'
+_PREFIX_LEN = len(_REGISTER_PREFIX)
 
-def _print(t, indent=0):
-    print(textwrap.indent(textwrap.dedent(t).strip(), prefix=' ' * indent))
+# Upper bound on REST requests in flight when fanning out per profile
+_MAX_CONCURRENT_REQUESTS = 8
 
+# Historical data CSV output is written to stdout in chunks of about 1 MiB
+_CSV_ROWS_PER_CHUNK = 4096
+_CSV_FLUSH_SIZE = 1 << 20
 
-def show_token(token: AuthToken):
-    buf = """
+
+# Output templates, dedented once at import time
+_TOKEN_TPL = textwrap.dedent("""
     Access Token: {access_token} 
     Refresh Token: {refresh_token}
     Expires in: {expires}
     User ID: {user_id}
     Token Type: {token_type}
-    """.format(access_token=token.access_token,
-               refresh_token=token.refresh_token,
-               expires=token.expiry,
-               user_id=token.user_id,
-               token_type=token.token_type)
+    """).strip()
+
+_SENSOR_TPL = textwrap.dedent("""
+    Sensor ID: {id}
+    Name: {arbitrary_name} ({name})
+    """).strip()
+
+_SENSOR_GROUP_TPL = textwrap.dedent("""
+    Sensor Group ID: {id}
+    
+    Sensors:
+    """).strip()
+
+_DEVICE_TPL = textwrap.dedent("""
+    Device ID: {id}
+    Name: {name}
+    Building Type: {building_type}
+    Timezone: {timezone}
+    """).strip()
+
+_BILLING_TPL = textwrap.dedent("""
+    Provider: {utility}
+    Zip Code: {zip_code}
+    Day of Month: {day_of_month}
+    USD per Kilowatt-Hour: {dollar_per_kwh}
+    """).strip()
+
+_REALTIME_TPL = textwrap.dedent("""Real-Time API:
+    URL: {ws_url}
+    Topic: {topic}
+    Prefix: {prefix}
+    Format: {fmt}
+    """).strip()
+
+_PROFILE_TPL = textwrap.dedent("""
+    Profile ID: {id}
+    
+    Billing:
+    """).strip()
+
+
+def _print(t, indent=0):
+    if indent:
+        # Same as textwrap.indent(): blank lines are left unpadded
+        pad = ' ' * indent
+        t = '\n'.join(pad + line if line.strip() else line
+                      for line in t.split('\n'))
+    print(t)
+
+
+def show_token(token: AuthToken):
+    buf = _TOKEN_TPL.format(access_token=token.access_token,
+                            refresh_token=token.refresh_token,
+                            expires=token.expiry,
+                            user_id=token.user_id,
+                            token_type=token.token_type)
     _print(buf)
     
 
 def show_sensor(sensor: models.Sensor, indent=0):
-    buf = """
-    Sensor ID: {id}
-    Name: {arbitrary_name} ({name})
-    """.format(id=sensor.id,
-               arbitrary_name=sensor.arbitrary_name,
-               name=sensor.name)
+    buf = _SENSOR_TPL.format(id=sensor.id,
+                             arbitrary_name=sensor.arbitrary_name,
+                             name=sensor.name)
     _print(buf, indent=indent)
 
 
 def show_sensor_group(sensor_group: models.SensorGroup, indent=0):
-    buf = """
-    Sensor Group ID: {id}
-    
-    Sensors:
-    """.format(id=sensor_group.id)
+    buf = _SENSOR_GROUP_TPL.format(id=sensor_group.id)
 
     _print(buf, indent=indent)
     for s in sensor_group.sensors:
@@ -57,15 +110,10 @@ def show_sensor_group(sensor_group: models.SensorGroup, indent=0):
 
 
 def show_device(device: models.Device, indent=0):
-    buf = """
-    Device ID: {id}
-    Name: {name}
-    Building Type: {building_type}
-    Timezone: {timezone}
-    """.format(id=device.id,
-               name=device.name,
-               building_type=device.building_type,
-               timezone=device.timezone)
+    buf = _DEVICE_TPL.format(id=device.id,
+                             name=device.name,
+                             building_type=device.building_type,
+                             timezone=device.timezone)
     _print(buf, indent=indent)
 
     _print('Sensor Groups:')
@@ -75,12 +123,7 @@ def show_device(device: models.Device, indent=0):
 
 
 def show_billing(billing: models.Billing, indent=0):
-    buf = """
-    Provider: {utility}
-    Zip Code: {zip_code}
-    Day of Month: {day_of_month}
-    USD per Kilowatt-Hour: {dollar_per_kwh}
-    """.format(
+    buf = _BILLING_TPL.format(
         utility=billing.billing_model.utility,
         zip_code=billing.zip_code,
         day_of_month=billing.day_of_month,
@@ -90,24 +133,15 @@ def show_billing(billing: models.Billing, indent=0):
 
 
 def show_realtime(config: models.RealTimeConfig, indent=0):
-    buf = """Real-Time API:
-    URL: {ws_url}
-    Topic: {topic}
-    Prefix: {prefix}
-    Format: {fmt}
-    """.format(ws_url=config.url,
-               topic=config.topic,
-               prefix=config.prefix,
-               fmt=config.format)
+    buf = _REALTIME_TPL.format(ws_url=config.url,
+                               topic=config.topic,
+                               prefix=config.prefix,
+                               fmt=config.format)
     _print(buf, indent=indent)
 
 
 def show_profile(profile: models.Profile, indent=0):
-    buf = """
-    Profile ID: {id}
-    
-    Billing:
-    """.format(id=profile.id)
+    buf = _PROFILE_TPL.format(id=profile.id)
 
     _print(buf, indent=indent)
     show_billing(profile.billing, indent=indent+1)
@@ -117,25 +151,35 @@ def show_profile(profile: models.Profile, indent=0):
 
 
 def show_measurement(data: models.Measurement):
-    prefix = 'urn:energycurb:registers:curb:'
-    offset = len(prefix)
+    headers = [h[_PREFIX_LEN:] if h.startswith(_REGISTER_PREFIX) else h
+               for h in data.headers]
 
-    writer = csv.writer(sys.stdout)
-    headers = [h[offset:] if h.startswith(prefix) else h for h in data.headers]
+    # Build the CSV in memory and hand it to stdout in large chunks instead
+    # of going through sys.stdout row by row
+    buf = io.StringIO()
+    writer = csv.writer(buf)
     writer.writerow(headers)
-    for i in data.data:
-        writer.writerow(i)
 
+    rows = data.data
+    for i in range(0, len(rows), _CSV_ROWS_PER_CHUNK):
+        writer.writerows(rows[i:i + _CSV_ROWS_PER_CHUNK])
+        if buf.tell() >= _CSV_FLUSH_SIZE:
+            sys.stdout.write(buf.getvalue())
+            buf.seek(0)
+            buf.truncate()
+
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
-async def main(args: argparse.Namespace, event_loop: asyncio.AbstractEventLoop):
+
+async def main(args: argparse.Namespace):
     clients = []
-    l = event_loop if event_loop is not None else asyncio.get_event_loop()
 
     async with RestApiClient(username=args.username,
                              password=args.password,
                              client_secret=args.client_secret,
                              client_token=args.client_token,
-                             loop=l) as client:
+                             eager_tasks=True) as client:
 
         if args.fetch_token:
             show_token(await client.fetch_access_token())
@@ -143,23 +187,39 @@ async def main(args: argparse.Namespace, event_loop: asyncio.AbstractEventLoop):
         if args.refresh_token:
             show_token(await client.refresh_access_token())
 
+        profiles, devices = [], []
+        need_profiles = args.profiles or args.historical_data
+        if need_profiles and args.devices:
+            profiles, devices = await client.bootstrap()
+        elif need_profiles:
+            profiles = await client.profiles()
+        elif args.devices:
+            devices = await client.devices()
+
         if args.profiles:
-            for profile in await client.profiles():
+            for profile in profiles:
                 show_profile(profile)
-                c = RealTimeClient(config=profile.real_time[0])
+                c = RealTimeClient(config=profile.real_time[0],
+                                   eager_tasks=True)
                 clients.append(c)
 
-        if args.devices:
-            for device in await client.devices():
-                show_device(device)
+        for device in devices:
+            show_device(device)
 
         if args.historical_data:
-            for profile in await client.profiles():
-                x = await client.historical_data(profile_id=profile.id,
-                                                 granularity=args.granularity,
-                                                 unit=args.unit,
-                                                 since=args.since,
-                                                 until=args.until,)
+            limit = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+
+            async def fetch(profile: models.Profile) -> models.Measurement:
+                async with limit:
+                    return await client.historical_data(
+                        profile_id=profile.id,
+                        granularity=args.granularity,
+                        unit=args.unit,
+                        since=args.since,
+                        until=args.until)
+
+            measurements = await asyncio.gather(*[fetch(p) for p in profiles])
+            for x in measurements:
                 show_measurement(x)
 
 
@@ -213,11 +273,30 @@ def get_parser() -> argparse.ArgumentParser:
                                  RestApiClient.DOLLAR_PER_HOUR],
                         default=RestApiClient.WATT,
                         help='Historical data reporting unit')
+
+    # Development
+    parser.add_argument('--vcr-cassette', default=None, metavar='PATH',
+                        help='Record/replay HTTP interactions with vcrpy')
     return parser
 
 
+def run(coro):
+    """
+    Run the coroutine to completion on a fresh event loop where supported
+    (Python 3.7+), or on the default loop otherwise
+    """
+    if hasattr(asyncio, 'run'):
+        return asyncio.run(coro)
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
 if __name__ == '__main__':
-    import vcr
-    with vcr.VCR(serializer='yaml').use_cassette('/tmp/x.yaml'):
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(main(get_parser().parse_args(), loop))
+    args = get_parser().parse_args()
+    install_uvloop()
+
+    if args.vcr_cassette:
+        import vcr
+        with vcr.VCR(serializer='yaml').use_cassette(args.vcr_cassette):
+            run(main(args))
+    else:
+        run(main(args))
@@ -7,46 +7,83 @@ import textwrap
 from curb_energy.client import AuthToken
 from curb_energy.client import RealTimeClient
 from curb_energy.client import RestApiClient
+from curb_energy.runtime import install_uvloop
 from curb_energy import models
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
 logger = logging.getLogger(__name__)
 
-is_streaming = False
 
-
-def stop():
-    global is_streaming
-    is_streaming = False
-
-
-async def stream(client: RealTimeClient):
-    global is_streaming
-    is_streaming = True
-
-    while is_streaming:
+async def _reader(client: RealTimeClient, queue: asyncio.Queue):
+    while True:
         if not client.is_connected:
             await client.connect()
 
-        data = await client.read()
-        logger.info(data)
-
-    await client.disconnect()
-
-
-async def main(args: argparse.Namespace, event_loop: asyncio.AbstractEventLoop):
-    l = event_loop if event_loop is not None else asyncio.get_event_loop()
-    clients = []
-
-    async with RestApiClient(username=args.username, password=args.password,
-                             loop=l) as client:
-        for profile in await client.profiles():
-            r_client = RealTimeClient(config=profile.real_time[0])
-            await r_client.connect()
-            clients.append(r_client)
-
-    await asyncio.gather(*[stream(c) for c in clients], loop=l)
+        await queue.put(await client.read())
+
+
+async def stream(client: RealTimeClient, stopping: asyncio.Event):
+    # Read ahead into a bounded queue so the next message is fetched while
+    # the current one is being handled
+    queue = asyncio.Queue(maxsize=64)
+    reader = asyncio.ensure_future(_reader(client, queue))
+
+    # Wake up as soon as a message arrives, a stop is requested, or the
+    # reader fails, rather than blocking on the next message
+    stop = asyncio.ensure_future(stopping.wait())
+    try:
+        while not stopping.is_set():
+            get = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait((get, stop, reader),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if get in done:
+                logger.info(get.result())
+                continue
+
+            get.cancel()
+            if reader in done:
+                # Propagate the reader's error
+                reader.result()
+            break
+    finally:
+        stop.cancel()
+        reader.cancel()
+        # Let the reader finish before draining the queue it fills. This does
+        # not raise, so its cancellation (or an error already propagated
+        # above) does not skip the clean-up.
+        await asyncio.wait((reader,))
+
+        while not queue.empty():
+            logger.info(queue.get_nowait())
+        await client.disconnect()
+
+
+async def main(args: argparse.Namespace):
+    l = asyncio.get_event_loop()
+
+    stopping = asyncio.Event()
+    l.add_signal_handler(signal.SIGINT, stopping.set)
+    l.add_signal_handler(signal.SIGTERM, stopping.set)
+
+    async with RestApiClient(username=args.username,
+                             password=args.password,
+                             eager_tasks=True) as client:
+        clients = [RealTimeClient(config=profile.real_time[0],
+                                  eager_tasks=True)
+                   for profile in await client.profiles()]
+
+    # Perform all the handshakes at once; if any of them fails, close the
+    # connections that did succeed before bailing out
+    results = await asyncio.gather(*[c.connect() for c in clients],
+                                   return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        await asyncio.gather(*[c.disconnect() for c in clients
+                               if c.is_connected])
+        raise errors[0]
+
+    await asyncio.gather(*[stream(c, stopping) for c in clients])
 
 
 def get_parser() -> argparse.ArgumentParser:
@@ -69,8 +106,16 @@ def get_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def run(coro):
+    """
+    Run the coroutine to completion on a fresh event loop where supported
+    (Python 3.7+), or on the default loop otherwise
+    """
+    if hasattr(asyncio, 'run'):
+        return asyncio.run(coro)
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
 if __name__ == '__main__':
-    loop = asyncio.get_event_loop()
-    loop.add_signal_handler(signal.SIGINT, stop)
-    loop.add_signal_handler(signal.SIGTERM, stop)
-    loop.run_until_complete(main(get_parser().parse_args(), loop))
+    install_uvloop()
+    run(main(get_parser().parse_args()))
@@ -5,24 +5,41 @@ import vcr
 
 here = os.path.dirname(__file__)
 
+FIXTURES_DIR = os.path.join(here, '..', 'fixtures')
+CASSETTES_DIR = os.path.join(FIXTURES_DIR, 'cassettes')
+REST_RESPONSES_DIR = os.path.join(FIXTURES_DIR, 'rest_responses')
+
 
 @pytest.fixture
 def fixtures_dir():
-    return os.path.join(here, '..', 'fixtures')
+    return FIXTURES_DIR
 
 
 @pytest.fixture
-def cassettes_fixtures_dir(fixtures_dir):
-    return os.path.join(fixtures_dir, 'cassettes')
+def cassettes_fixtures_dir():
+    return CASSETTES_DIR
 
 
 @pytest.fixture
-def rest_fixtures_dir(fixtures_dir):
-    return os.path.join(fixtures_dir, 'rest_responses')
+def rest_fixtures_dir():
+    return REST_RESPONSES_DIR
+
+
+@pytest.fixture(scope='session')
+def rest_responses():
+    """
+    The contents of every REST response fixture keyed by filename, read
+    from disk once per test session
+    """
+    responses = {}
+    for filename in os.listdir(REST_RESPONSES_DIR):
+        with open(os.path.join(REST_RESPONSES_DIR, filename)) as f:
+            responses[filename] = f.read()
+    return responses
 
 
 vcr.default_vcr = vcr.VCR(
-    cassette_library_dir=cassettes_fixtures_dir(fixtures_dir()),
+    cassette_library_dir=CASSETTES_DIR,
     record_mode='none',
 )
 vcr.use_cassette = vcr.default_vcr.use_cassette
@@ -1,3 +1,4 @@
+import pickle
 import pytest
 from curb_energy.client import AuthToken
 
@@ -13,7 +14,7 @@ def token():
 
 def test_blank_tokens_are_invalid():
     t = AuthToken()
-    assert not t.is_valid
+    assert t.is_valid is False
 
 
 def test_expired_tokens(token):
@@ -26,3 +27,17 @@ def test_expired_tokens(token):
 
 def test_transformation(token):
     assert token == AuthToken.from_json(token.json())
+
+
+def test_pickle(token):
+    assert token == pickle.loads(pickle.dumps(token))
+
+
+def test_no_adhoc_attributes(token):
+    with pytest.raises(AttributeError):
+        token.foo = 'bar'
+
+
+def test_non_ascii_access_token():
+    with pytest.raises(ValueError):
+        AuthToken(access_token='töken')
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from curb_energy.client import AuthToken
 from curb_energy import models
 
@@ -30,6 +31,16 @@ def test_token_equality():
     assert t1.expiry != t2.expiry
 
 
+def test_token_generated_on():
+    token = AuthToken(access_token='abc', refresh_token='def', expires_in=300)
+    assert token.is_valid
+
+    # Moving the generation date moves the expiry along with it
+    token.generated_on -= timedelta(0, 600)
+    assert token.expiry == token.generated_on + timedelta(0, 300)
+    assert not token.is_valid
+
+
 def test_token_inequality():
     t1 = AuthToken(access_token='abc', refresh_token='def', user_id=100)
     assert t1 != {} and not (t1 == {})
@@ -144,3 +155,52 @@ def test_billing():
     assert m1 != m2
 
     assert m1 != {} and not m1 == {}
+
+
+def test_models_have_no_instance_dict():
+    for m in (models.Sensor(), models.SensorGroup(), models.Device(),
+              models.Register(), models.Profile(), models.Billing(),
+              models.BillingModel(), models.RealTimeConfig()):
+        assert not hasattr(m, '__dict__')
+
+
+def test_find_register_tracks_changes():
+    registers = [models.Register(id=i) for i in range(0, 5)]
+    profile = models.Profile(id=1, registers=registers)
+    assert profile.find_register(5) is None
+
+    extra = models.Register(id=5)
+    profile.registers.append(extra)
+    assert profile.find_register(5) is extra
+
+    profile.registers = [models.Register(id=7)]
+    assert profile.find_register(0) is None
+    assert profile.find_register(7) is profile.registers[0]
+
+
+def test_find_register_tracks_replaced_elements():
+    registers = [models.Register(id=i) for i in range(0, 5)]
+    profile = models.Profile(id=1, registers=registers)
+    assert profile.find_register(0) is registers[0]
+
+    # Replacing an element keeps the list and its length
+    replacement = models.Register(id=9)
+    profile.registers[0] = replacement
+    assert profile.find_register(0) is None
+    assert profile.find_register(9) is replacement
+
+    r1, r2 = registers[1], registers[2]
+    profile.registers[1], profile.registers[2] = r2, r1
+    assert profile.find_register(1) is r1
+    assert profile.find_register(2) is r2
+
+
+def test_asdict_skips_private_attributes():
+    profile = models.Profile(id=1)
+    profile.find_register('x')
+
+    d = profile._asdict()
+    assert d['id'] == 1
+    assert '_register_index' not in d
+    assert models.Sensor(id=2)._asdict() == {'id': 2, 'name': None,
+                                             'arbitrary_name': None}
@@ -1,5 +1,8 @@
+import asyncio
 import json
 import pytest
+import threading
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from curb_energy.client import RealTimeClient
 from curb_energy.models import RealTimeConfig
@@ -53,11 +56,16 @@ async def test_context_manager(driver, config):
     assert not client.is_connected
 
 
+def make_message(data):
+    payload = SimpleNamespace(data=data)
+    header = SimpleNamespace(topic_name='curb/abcdefgh/active')
+    packet = SimpleNamespace(payload=payload, variable_header=header)
+    return SimpleNamespace(publish_packet=packet)
+
+
 @pytest.mark.asyncio
 async def test_read(client):
-    payload = MagicMock(data=json.dumps({'ts': 1, 'measurements': {}}))
-    packet = MagicMock(payload=payload)
-    message = MagicMock(publish_packet=packet)
+    message = make_message(json.dumps({'ts': 1, 'measurements': {}}))
 
     client.driver.mocked.deliver_message.return_value = message
     assert await client.read()
@@ -65,9 +73,120 @@ async def test_read(client):
 
 @pytest.mark.asyncio
 async def test_read_error(client):
-    payload = MagicMock(data='not a valid json string')
-    packet = MagicMock(payload=payload)
-    message = MagicMock(publish_packet=packet)
+    message = make_message('not a valid json string')
 
     client.driver.mocked.deliver_message.return_value = message
     assert not await client.read()
+
+
+@pytest.fixture
+def queued_client(config, driver):
+    class QueuedDummy(driver):
+        def __init__(self):
+            super().__init__()
+            self._queue = None
+
+        @property
+        def queue(self):
+            # Created on first use from the test, so it binds to the
+            # running loop
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            return self._queue
+
+        async def deliver_message(self):
+            return await self.queue.get()
+
+    return RealTimeClient(config=config, driver=QueuedDummy)
+
+
+@pytest.mark.asyncio
+async def test_read_batch(queued_client):
+    queue = queued_client.driver.queue
+    for i in range(5):
+        queue.put_nowait(make_message(json.dumps({'ts': i,
+                                                  'measurements': {}})))
+    queue.put_nowait(make_message('not a valid json string'))
+
+    batch = await queued_client.read_batch(max_n=3)
+    assert [m.timestamp for m in batch] == [0, 1, 2]
+
+    # Invalid messages are skipped, and the batch ends once the queue is
+    # drained and the timeout expires
+    batch = await queued_client.read_batch(max_n=10, timeout=0.01)
+    assert [m.timestamp for m in batch] == [3, 4]
+
+    # The delivery pending at the timeout is not lost
+    queue.put_nowait(make_message(json.dumps({'ts': 5, 'measurements': {}})))
+    assert (await queued_client.read()).timestamp == 5
+
+
+@pytest.mark.asyncio
+async def test_read_bytes_payload(client):
+    data = json.dumps({'ts': 1, 'measurements': []}).encode()
+    client.driver.mocked.deliver_message.return_value = make_message(data)
+
+    message = await client.read()
+    assert message.timestamp == 1
+    assert message.measurements == []
+
+
+@pytest.mark.asyncio
+async def test_read_batch_max_wait(queued_client):
+    queue = queued_client.driver.queue
+    for i in range(3):
+        queue.put_nowait(make_message(json.dumps({'ts': i,
+                                                  'measurements': {}})))
+
+    # No time is allowed past the first message, so only messages that are
+    # immediately ready make it into the batch, without waiting for the
+    # timeout
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    batch = await queued_client.read_batch(max_n=10, timeout=1, max_wait=0)
+    assert loop.time() - start < 0.5
+    assert len(batch) == 3
+    await queued_client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_read_batch_max_wait_bounds_stream(queued_client):
+    queue = queued_client.driver.queue
+
+    async def produce():
+        i = 0
+        while True:
+            queue.put_nowait(make_message(json.dumps({'ts': i,
+                                                      'measurements': {}})))
+            i += 1
+            await asyncio.sleep(0.01)
+
+    producer = asyncio.ensure_future(produce())
+    loop = asyncio.get_event_loop()
+    try:
+        # Messages arrive well within the timeout, so only max_wait ends the
+        # batch
+        start = loop.time()
+        batch = await queued_client.read_batch(max_n=1000, timeout=1,
+                                               max_wait=0.1)
+        elapsed = loop.time() - start
+    finally:
+        producer.cancel()
+        await queued_client.disconnect()
+
+    assert 1 < len(batch) < 1000
+    assert elapsed < 0.5
+    assert [m.timestamp for m in batch] == list(range(len(batch)))
+
+
+def test_constructor_without_event_loop(config, driver):
+    # Threads other than the main one have no event loop
+    clients = []
+    thread = threading.Thread(
+        target=lambda: clients.append(RealTimeClient(config=config,
+                                                     driver=driver)))
+    thread.start()
+    thread.join()
+
+    assert len(clients) == 1
+    assert not clients[0].is_connected
@@ -1,21 +1,26 @@
+import aiohttp
+import asyncio
 import datetime
 import pytest
 import vcr
+from types import MappingProxyType
 from curb_energy.client import AuthToken
 from curb_energy.client import RestApiClient
+from curb_energy.client import _default_ssl_context
 from curb_energy.errors import CurbBaseException
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def config():
-    return {'username': 'dummy',
-            'password': 'dummy',
-            }
+    # Shared by every test in the module, so hand out a read-only view
+    return MappingProxyType({'username': 'dummy',
+                             'password': 'dummy',
+                             })
 
 
 @pytest.fixture
 def client(config: dict, event_loop):
-    return RestApiClient(**config, loop=event_loop)
+    return RestApiClient(**config)
 
 
 @pytest.mark.asyncio
@@ -62,7 +67,7 @@ async def test_context_manager_with_expired_token(config):
 async def test_authenticate(client: RestApiClient):
     with vcr.use_cassette('success.yaml'):
         token = await client.authenticate()
-        client.session.close()
+        await client.close()
 
     assert token == client.auth_token
 
@@ -81,6 +86,15 @@ async def test_profiles(client: RestApiClient):
             assert await client.profiles()
 
 
+@pytest.mark.asyncio
+async def test_bootstrap(client: RestApiClient):
+    with vcr.use_cassette('success.yaml'):
+        async with client:
+            profiles, devices = await client.bootstrap()
+            assert profiles
+            assert devices
+
+
 @pytest.mark.asyncio
 async def test_implicit_entrypoint_loading(client: RestApiClient):
     with vcr.use_cassette('success.yaml'):
@@ -94,7 +108,7 @@ async def test_implicit_entrypoint_loading(client: RestApiClient):
         assert await client.profiles()
         assert client._entry_point
 
-    await client.session.close()
+    await client.close()
 
 
 @pytest.mark.asyncio
@@ -106,6 +120,62 @@ async def test_historical(client: RestApiClient):
             assert await client.historical_data(profile_id=5050, until=now)
 
 
+@pytest.mark.asyncio
+async def test_historical_cache(config):
+    now = int(datetime.datetime.utcnow().timestamp())
+    with vcr.use_cassette('success.yaml', match_on=['host', 'port', 'path'],
+                          allow_playback_repeats=True) as cassette:
+        async with RestApiClient(cache_ttl=30, **config) as client:
+            first = await client.historical_data(profile_id=5050, until=now)
+            count = cassette.play_count
+
+            # Identical windows are served from the cache
+            assert await client.historical_data(profile_id=5050,
+                                                until=now) is first
+            assert cassette.play_count == count
+
+            # Open-ended windows are never cached
+            await client.historical_data(profile_id=5050)
+            count = cassette.play_count
+            await client.historical_data(profile_id=5050)
+            assert cassette.play_count > count
+
+
+@pytest.mark.asyncio
+async def test_historical_cache_evicts_least_recently_used(config,
+                                                          monkeypatch):
+    async def fetch(self, schema_class, url, params=None):
+        return object()
+
+    monkeypatch.setattr(RestApiClient, '_fetch', fetch)
+    monkeypatch.setattr(RestApiClient, 'HISTORICAL_CACHE_SIZE', 2)
+    token = AuthToken(access_token='a', refresh_token='b', expires_in=300)
+    client = RestApiClient(auth_token=token, cache_ttl=30, **config)
+
+    a = await client.historical_data(profile_id=1, until=1)
+    b = await client.historical_data(profile_id=2, until=1)
+    assert await client.historical_data(profile_id=1, until=1) is a
+
+    # Adding a third entry evicts the least recently used one
+    await client.historical_data(profile_id=3, until=1)
+    assert await client.historical_data(profile_id=1, until=1) is a
+    assert await client.historical_data(profile_id=2, until=1) is not b
+
+
+@pytest.mark.asyncio
+async def test_historical_cache_disabled_by_default(client: RestApiClient):
+    now = int(datetime.datetime.utcnow().timestamp())
+    with vcr.use_cassette('success.yaml', match_on=['host', 'port', 'path'],
+                          allow_playback_repeats=True) as cassette:
+        async with client:
+            first = await client.historical_data(profile_id=5050, until=now)
+            count = cassette.play_count
+
+            assert await client.historical_data(profile_id=5050,
+                                                until=now) is not first
+            assert cassette.play_count > count
+
+
 @pytest.mark.asyncio
 async def test_authenticate_failed(client: RestApiClient):
     with vcr.use_cassette('unauthorized.yaml', match_on=['host', 'port']):
@@ -134,7 +204,7 @@ async def test_unauthorized(client: RestApiClient):
         client._auth_token = bogus
         assert not await client.refresh_access_token()
 
-        await client.session.close()
+        await client.close()
 
 
 @pytest.mark.asyncio
@@ -179,3 +249,217 @@ async def test_refresh_expired_token_before_request(client: RestApiClient):
             assert client.auth_token.is_valid
             assert old_token is not client.auth_token
             assert old_token.expiry < client.auth_token.expiry
+
+
+@pytest.mark.asyncio
+async def test_connector_kwargs(config):
+    client = RestApiClient(connector_kwargs={'limit': 5}, **config)
+    assert client.session.connector.limit == 5
+    assert client.session.connector.limit_per_host == \
+        RestApiClient.CONNECTOR_KWARGS['limit_per_host']
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_auth_headers_cached(config):
+    token = AuthToken(access_token='abc', refresh_token='def', expires_in=300)
+    client = RestApiClient(auth_token=token, **config)
+
+    headers = client._auth_headers()
+    assert client._auth_headers() is headers
+
+    client._auth_token = AuthToken(access_token='xyz', refresh_token='def',
+                                   expires_in=300)
+    assert client._auth_headers() is not headers
+    assert client._auth_headers() != headers
+    await client.close()
+
+
+def test_default_ssl_context_is_shared():
+    assert _default_ssl_context() is _default_ssl_context()
+
+
+def test_make_token_ignores_unknown_fields():
+    token = RestApiClient._make_token({'access_token': 'abc',
+                                       'refresh_token': 'def',
+                                       'expires_in': 300,
+                                       'user_id': 1,
+                                       'scope': 'read'})
+    assert token.access_token == 'abc'
+    assert token.token_type == 'bearer'
+
+
+@pytest.mark.asyncio
+async def test_shared_connector(config):
+    c1 = RestApiClient(**config)
+    c2 = RestApiClient(**config)
+    c3 = RestApiClient(connector_kwargs={}, **config)
+    assert c1.session.connector is c2.session.connector
+    assert c1.session.connector is not c3.session.connector
+
+    connector = c1.session.connector
+
+    # Closing a client leaves the shared pool open for the others
+    await c1.__aexit__(None, None, None)
+    assert c1.session.closed
+    assert not connector.closed
+
+    # The pool is closed once the last client using it exits
+    await c2.__aexit__(None, None, None)
+    assert connector.closed
+    await c3.__aexit__(None, None, None)
+
+    # Later clients get a fresh pool
+    c4 = RestApiClient(**config)
+    assert c4.session.connector is not connector
+    assert not c4.session.connector.closed
+    await c4.__aexit__(None, None, None)
+
+
+def test_loop_argument_is_deprecated(config, event_loop):
+    with pytest.warns(DeprecationWarning):
+        RestApiClient(loop=event_loop, **config)
+
+
+@pytest.mark.asyncio
+async def test_eager_tasks_are_opt_in(config, event_loop):
+    client = RestApiClient(**config)
+    assert client.session
+    assert event_loop.get_task_factory() is None
+    await client.close()
+
+
+def test_session_is_created_lazily(config):
+    client = RestApiClient(**config)
+    assert client._session is None
+
+
+@pytest.mark.asyncio
+async def test_external_session_is_not_closed(config):
+    session = aiohttp.ClientSession()
+    client = RestApiClient(session=session, **config)
+    assert client.session is session
+
+    await client.__aexit__(None, None, None)
+    assert not session.closed
+    await session.close()
+
+
+def test_auth_headers_send_raw_token(config):
+    token = AuthToken(access_token='abc', refresh_token='def', expires_in=300)
+    client = RestApiClient(auth_token=token, **config)
+    assert client._auth_headers() == {'Authorization': 'Bearer abc'}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_authentication(config, monkeypatch):
+    calls = []
+
+    async def fetch_access_token(self, *args, **kwargs):
+        calls.append(1)
+        await asyncio.sleep(0)
+        return AuthToken(access_token='a', refresh_token='b', expires_in=300)
+
+    monkeypatch.setattr(RestApiClient, 'fetch_access_token',
+                        fetch_access_token)
+    client = RestApiClient(**config)
+    t1, t2 = await asyncio.gather(client.authenticate(), client.authenticate())
+    assert t1 is t2
+    assert len(calls) == 1
+    await client.__aexit__(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_background_refresh(config, monkeypatch):
+    refreshed = AuthToken(access_token='c', refresh_token='d', expires_in=300)
+
+    async def refresh_access_token(self):
+        self._auth_token = refreshed
+        return refreshed
+
+    monkeypatch.setattr(RestApiClient, 'refresh_access_token',
+                        refresh_access_token)
+    token = AuthToken(access_token='a', refresh_token='b', expires_in=300)
+    async with RestApiClient(auth_token=token, **config) as client:
+        assert client._refresh_handle is not None
+
+        # Fire the scheduled refresh right away instead of waiting for it
+        client._start_refresh()
+        await client._refresh_task
+        assert client.auth_token is refreshed
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_refresh(config, monkeypatch):
+    calls = []
+
+    async def refresh_access_token(self):
+        calls.append(1)
+
+    monkeypatch.setattr(RestApiClient, 'refresh_access_token',
+                        refresh_access_token)
+    token = AuthToken(access_token='a', refresh_token='b', expires_in=300)
+    client = RestApiClient(auth_token=token, **config)
+    await client.__aenter__()
+    session = client.session
+    assert client._refresh_handle is not None
+
+    await client.close()
+    assert session.closed
+    assert client._refresh_handle is None
+
+    # A refresh that was already due does nothing once the client is closed
+    client._start_refresh()
+    assert client._refresh_task is None
+    assert not calls
+
+
+@pytest.mark.asyncio
+async def test_fetch_waits_for_refresh(config):
+    class Response(object):
+        status = 200
+
+        async def read(self):
+            return b'{"_links": {}}'
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+    class Session(object):
+        closed = False
+
+        def __init__(self):
+            self.headers = []
+
+        def get(self, url, headers=None, params=None):
+            self.headers.append(headers)
+            return Response()
+
+    old = AuthToken(access_token='a', refresh_token='b', expires_in=300)
+    new = AuthToken(access_token='c', refresh_token='d', expires_in=300)
+    session = Session()
+    client = RestApiClient(auth_token=old, session=session, **config)
+
+    # Requests made while a refresh holds the lock use the refreshed token
+    lock = client._get_refresh_lock()
+    await lock.acquire()
+    fetch = asyncio.ensure_future(client.entry_point())
+    await asyncio.sleep(0)
+    assert not session.headers
+
+    client._auth_token = new
+    lock.release()
+    await fetch
+    assert session.headers == [{'Authorization': 'Bearer c'}]
+
+
+def test_app_auth_cached(config):
+    client = RestApiClient(client_token='a', client_secret='b', **config)
+    auth = client._app_auth()
+    assert client._app_auth() is auth
+
+    client.client_secret = 'c'
+    assert client._app_auth().password == 'c'
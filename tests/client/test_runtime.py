@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import sys
+from unittest.mock import MagicMock
+from curb_energy.runtime import enable_eager_tasks
+from curb_energy.runtime import install_uvloop
+
+
+def test_install_uvloop(monkeypatch):
+    uvloop = MagicMock()
+    policy = asyncio.get_event_loop_policy()
+    monkeypatch.setitem(sys.modules, 'uvloop', uvloop)
+    monkeypatch.setattr(asyncio, 'set_event_loop_policy', MagicMock())
+
+    assert install_uvloop()
+    asyncio.set_event_loop_policy.assert_called_once_with(
+        uvloop.EventLoopPolicy.return_value)
+    assert asyncio.get_event_loop_policy() is policy
+
+
+def test_install_uvloop_unavailable(monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, 'uvloop', None)
+    assert not install_uvloop()
+
+    # uvloop is optional (and unsupported on Windows), so its absence is not
+    # worth a warning
+    assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+
+
+def test_enable_eager_tasks(monkeypatch):
+    loop = MagicMock()
+    loop.get_task_factory.return_value = None
+    monkeypatch.delattr(asyncio, 'eager_task_factory', raising=False)
+    assert not enable_eager_tasks(loop)
+    assert not loop.set_task_factory.called
+
+    factory = MagicMock()
+    monkeypatch.setattr(asyncio, 'eager_task_factory', factory, raising=False)
+    assert enable_eager_tasks(loop)
+    loop.set_task_factory.assert_called_once_with(factory)
+
+    # An existing task factory is never replaced
+    loop.reset_mock()
+    loop.get_task_factory.return_value = MagicMock()
+    assert not enable_eager_tasks(loop)
+    assert not loop.set_task_factory.called
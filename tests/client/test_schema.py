@@ -1,13 +1,9 @@
 import pytest
-import os
+import json
+import sys
 from curb_energy import schema
 
 
-def load(*args):
-    with open(os.path.join(*args)) as f:
-        return f.read()
-
-
 @pytest.mark.parametrize(
     ['filename', 'schema'],
     [
@@ -22,8 +18,8 @@ def load(*args):
         ('sensor_group.json', schema.SensorGroupSchema),
     ]
 )
-def test_transformation(rest_fixtures_dir, schema, filename):
-    buf = load(rest_fixtures_dir, filename)
+def test_transformation(rest_responses, schema, filename):
+    buf = rest_responses[filename]
 
     schema_instance = schema()
 
@@ -44,7 +40,64 @@ def test_transformation(rest_fixtures_dir, schema, filename):
     assert not err
 
 
-def test_historical(rest_fixtures_dir):
-    buf = load(rest_fixtures_dir, 'profile_historical_data.json')
+def test_historical(rest_responses):
+    buf = rest_responses['profile_historical_data.json']
     h = schema.HistoricalData().loads(buf)
     assert h
+
+
+def test_get_schema_is_memoized():
+    s = schema.get_schema(schema.ProfileSchema)
+    assert s is schema.get_schema(schema.ProfileSchema)
+    assert s is not schema.get_schema(schema.ProfileSchema, many=True)
+    assert schema.get_schema(schema.ProfileSchema, many=True).many
+
+
+@pytest.mark.parametrize(
+    ['schema', 'href'],
+    [
+        (schema.SensorSchema, '/api/sensors/12345'),
+        (schema.SensorGroupSchema, '/api/sensor_groups/12345'),
+        (schema.DeviceSchema, '/api/devices/12345'),
+    ]
+)
+def test_id_from_self_link(schema, href):
+    model, err = schema().load({'_links': {'self': {'href': href}}})
+    assert not err
+    assert model.id == 12345
+
+
+def test_profile_register_groups_share_registers(rest_responses):
+    raw = json.loads(rest_responses['profile.json'])
+    profile, err = schema.ProfileSchema().load(raw)
+    assert not err
+
+    for g in ['use', 'normals', 'grid', 'solar']:
+        group = getattr(profile.register_groups, g)
+        # Group order is preserved
+        assert [r.id for r in group] == \
+            [r['id'] for r in raw['register_groups'][g]]
+        for r in group:
+            assert r is profile.find_register(r.id)
+
+
+def test_register_ids_are_interned(rest_responses):
+    profile, err = schema.ProfileSchema().loads(rest_responses['profile.json'])
+    assert not err
+
+    rid = ''.join(['urn:energycurb:registers:curb:', 'crzvgqq5:0:a'])
+    assert profile.registers[0].id is sys.intern(rid)
+
+
+def test_historical_data_matrix():
+    payload = {'results': [{'granularity': '1H', 'unit': 'w',
+                            'headers': ['a', 'b'],
+                            'data': [[1, '2.5'], [3.0, 4]]}]}
+    m, err = schema.HistoricalData().load(payload)
+    assert not err
+    assert m.data == [[1.0, 2.5], [3.0, 4.0]]
+    assert all(isinstance(v, float) for row in m.data for v in row)
+
+    payload['results'][0]['data'] = [[1, None]]
+    _, err = schema.HistoricalData().load(payload)
+    assert 'data' in err